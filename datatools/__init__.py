@@ -2,7 +2,7 @@
 """
 datatools: A lightweight toolkit for EDA, cleaning, and statistical analysis.
 """
-from .loader import load_dataframe
+from .loader import load_dataframe, reduce_mem_usage, to_arrow_strings
 from .cleaner import (
     drop_columns,
     fill_missing,
@@ -15,7 +15,9 @@ from .analyzer import (
     summarize_dataset,
     analyze_distribution,
     test_normality,
-    check_linearity_residuals
+    test_normality_many,
+    check_linearity_residuals,
+    check_linearity_residuals_many
 )
 from .utils import (
     is_numeric_series,
@@ -30,6 +32,8 @@ __author__ = "Li-Hsiang Hsu"
 __all__ = [
     # Loader
     "load_dataframe",
+    "reduce_mem_usage",
+    "to_arrow_strings",
     # Cleaner
     "drop_columns",
     "fill_missing",
@@ -46,7 +50,9 @@ __all__ = [
     "summarize_dataset",
     "analyze_distribution",
     "test_normality",
+    "test_normality_many",
     "check_linearity_residuals",
+    "check_linearity_residuals_many",
     # Utils
     "is_numeric_series",
     "list_numeric_columns",
@@ -5,11 +5,6 @@ Includes distribution inspection, normality tests and linearity checks.
 """
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
-from scipy import stats
-import statsmodels.api as sm
-from statsmodels.formula.api import ols
 from typing import Dict, Tuple, List, Optional
 import warnings
 
@@ -21,114 +16,223 @@ def generate_column_info(df: pd.DataFrame, thresh_na: float = 0.25, thresh_balan
         'Most common value', 'Alerts'
     ])
 
-    info['Dtype'] = df.dtypes.values
-    info['Missing values (nb)'] = df.isna().sum()
-    info['Missing values (%)'] = df.isna().sum() / len(df) * 100
-    info['Unique values (nb)'] = df.nunique()
-
-    def get_unique_list(col):
-        if col.nunique() > 10:
-            return 'Lots of categories or values'
-        else:
-            return str(list(col.unique()))
-
-    def get_mode(col):
-        try:
-            mode_val = col.mode()[0]
-            return mode_val if not pd.isna(mode_val) else 'NaN'
-        except:
-            return 'N/A'
-
-    def alerts(col):
-        if (col.isna().sum() / len(df)) > thresh_na:
-            return 'Lots of missing items'
-        elif len(col) > 0 and col.value_counts(normalize=True).values[0] > thresh_balance:
-            return 'Imbalanced data'
+    # Column-wise aggregates are computed once and reused by every derived field
+    n = len(df)
+    nas = df.isna().sum().to_numpy()
+    nuniq = df.nunique().to_numpy()
+    na_rate = nas / n if n else np.full(len(df.columns), np.nan)
+
+    unique_list = np.where(
+        nuniq > 10,
+        'Lots of categories or values',
+        [str(list(df.iloc[:, i].unique())) if nuniq[i] <= 10 else '' for i in range(df.shape[1])]
+    )
+
+    # Per column rather than one df.mode(): the frame form pads every column to the
+    # longest mode list, which for an ID column is as long as the data
+    modes = []
+    for i in range(df.shape[1]):
+        mode = df.iloc[:, i].mode()
+        if mode.empty:
+            modes.append('N/A')
         else:
-            return 'Looks fine'
+            modes.append(mode.iat[0] if not pd.isna(mode.iat[0]) else 'NaN')
+
+    # Mode frequency is only needed where the missing-values alert does not fire;
+    # the max of the unsorted counts avoids sorting the full value-count table
+    top_freq = np.array([
+        df.iloc[:, i].value_counts(normalize=True, sort=False).max()
+        if na_rate[i] <= thresh_na and nas[i] < n else 0.0
+        for i in range(df.shape[1])
+    ])
+    # First matching condition wins, as in the original per-column if/elif
+    alerts = np.select(
+        [na_rate > thresh_na, top_freq > thresh_balance],
+        ['Lots of missing items', 'Imbalanced data'],
+        default='Looks fine'
+    )
 
-    info['Unique values (list)'] = df.apply(get_unique_list)
-    info['Most common value'] = df.apply(get_mode)
-    info['Alerts'] = df.apply(alerts)
+    info['Dtype'] = df.dtypes.values
+    info['Missing values (nb)'] = nas
+    info['Missing values (%)'] = na_rate * 100
+    info['Unique values (nb)'] = nuniq
+    info['Unique values (list)'] = unique_list
+    info['Most common value'] = modes
+    info['Alerts'] = alerts
 
     return info
 
-def summarize_dataset(df: pd.DataFrame) -> Dict[str, np.number]:
+def _dtype_kind(dtype) -> str:
+    """Bucket a dtype as numerical ('num'), categorical ('cat') or 'other'."""
+    # Same numeric set as select_dtypes(include='number'): no bools, but timedeltas
+    if pd.api.types.is_timedelta64_dtype(dtype):
+        return 'num'
+    if pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype):
+        return 'num'
+    if isinstance(dtype, pd.CategoricalDtype) or pd.api.types.is_string_dtype(dtype):
+        return 'cat'
+    return 'other'
+
+
+def summarize_dataset(df: pd.DataFrame, dup_mask: Optional[pd.Series] = None) -> Dict[str, np.number]:
+    """Dataset-level counts; pass dup_mask (df.duplicated()) to reuse an existing row hash."""
+    if dup_mask is None:
+        dup_mask = df.duplicated()
     total_cells = df.size
     missing = df.isna().sum().sum()
+    # Single pass over the dtypes instead of one select_dtypes call per bucket
+    kinds = df.dtypes.map(_dtype_kind).value_counts()
     return {
         'rows': len(df),
         'columns': len(df.columns),
         'total missing values': missing,
         'missing percentage': round((missing / total_cells) * 100, 2),
-        'duplicates': df.duplicated().sum(),
-        'numerical columns': len(df.select_dtypes(include='number').columns),
-        'categorical columns': len(df.select_dtypes(include=['object', 'category']).columns),
-        'other types': len(df.dtypes) - len(df.select_dtypes(include=['number', 'object', 'category']).columns),
+        'duplicates': dup_mask.sum(),
+        'numerical columns': int(kinds.get('num', 0)),
+        'categorical columns': int(kinds.get('cat', 0)),
+        'other types': int(kinds.get('other', 0)),
         'total memory': df.memory_usage(deep=True).sum()
-
-
     }
 
 def analyze_distribution(df: pd.DataFrame, columns: List[str]) -> Dict[str, pd.Series]:
     """Compute summary stats for numerical columns."""
-    results = {}
+    dtypes = df.dtypes
+    numeric_cols = []
     for col in columns:
         if col not in df.columns:
             warnings.warn(f"Column '{col}' not found.")
             continue
-        if not pd.api.types.is_numeric_dtype(df[col]):
+        if not pd.api.types.is_numeric_dtype(dtypes[col]):
             warnings.warn(f"Column '{col}' is not numeric. Skipping.")
             continue
+        if col not in numeric_cols:
+            numeric_cols.append(col)
+
+    if not numeric_cols:
+        return {}
+
+    # Frame-level reductions cover every column at once; bools are described as 0/1
+    sub = df[numeric_cols]
+    bool_cols = [col for col in numeric_cols if pd.api.types.is_bool_dtype(dtypes[col])]
+    if bool_cols:
+        sub = sub.astype({col: float for col in bool_cols})
+    desc = sub.describe(percentiles=[0.25, 0.5, 0.75])
+
+    summary = pd.DataFrame({
+        'mean': desc.loc['mean'],
+        # Not describe()'s 50% row: its interpolated quantiles turn NaN next to inf
+        'median': sub.median(),
+        'std': desc.loc['std'],
+        'skewness': sub.skew(),
+        'kurtosis': sub.kurt(),
+        'min': desc.loc['min'],
+        'max': desc.loc['max'],
+        'q25': desc.loc['25%'],
+        'q75': desc.loc['75%']
+    })
+    return {col: summary.loc[col].rename(None) for col in numeric_cols}
+
+
+# scipy.stats is imported by the tests themselves: it is the slowest import in the
+# package, and the Streamlit app loads datatools on every page
+def _shapiro(data: np.ndarray) -> Dict[str, float]:
+    from scipy import stats
+    if len(data) > 5000:
+        return {'error': 'Shapiro-Wilk test only supports up to 5000 samples'}
+    stat, p = stats.shapiro(data)
+    return {'statistic': stat, 'p_value': p}
 
-        series = df[col].dropna()
-        results[col] = pd.Series({
-            'mean': series.mean(),
-            'median': series.median(),
-            'std': series.std(),
-            'skewness': series.skew(),
-            'kurtosis': series.kurt(),
-            'min': series.min(),
-            'max': series.max(),
-            'q25': series.quantile(0.25),
-            'q75': series.quantile(0.75)
-        })
-    return results
+
+def _kstest(data: np.ndarray) -> Dict[str, float]:
+    from scipy import stats
+    stat, p = stats.kstest(data, 'norm')
+    return {'statistic': stat, 'p_value': p}
+
+
+def _anderson(data: np.ndarray) -> Dict[str, float]:
+    from scipy import stats
+    result = stats.anderson(data, dist='norm')
+    return {
+        'test_statistic': result.statistic,
+        'critical_values': result.critical_values.tolist(),
+        'significance_levels': result.significance_level.tolist()
+    }
+
+
+# Normality tests by method name; each takes the NaN-free values as an ndarray
+_NORM_TESTS = {
+    'shapiro': _shapiro,
+    'kstest': _kstest,
+    'anderson': _anderson,
+}
 
 
 def test_normality(df: pd.DataFrame, column: str, method: str = 'shapiro') -> Dict[str, float]:
     """Perform normality test on a single column."""
-    data = df[column].dropna()
+    data = df[column].dropna().to_numpy()
     if len(data) < 3:
         return {'error': 'Not enough data points'}
 
-    if method == 'shapiro':
-        if len(data) > 5000:
-            return {'error': 'Shapiro-Wilk test only supports up to 5000 samples'}
-        stat, p = stats.shapiro(data)
-    elif method == 'kstest':
-        stat, p = stats.kstest(data, 'norm')
-    elif method == 'anderson':
-        result = stats.anderson(data, dist='norm')
-        return {
-            'test_statistic': result.statistic,
-            'critical_values': result.critical_values.tolist(),
-            'significance_levels': result.significance_level.tolist()
-        }
-    else:
+    test = _NORM_TESTS.get(method)
+    if test is None:
         return {'error': 'Unsupported method'}
+    return test(data)
 
-    return {'statistic': stat, 'p_value': p}
 
+def test_normality_many(df: pd.DataFrame, columns: List[str], method: str = 'shapiro') -> Dict[str, Dict[str, float]]:
+    """Perform the same normality test on several columns."""
+    # Non-missing counts for every column in one pass, so short columns skip the conversion
+    counts = df[columns].count()
+    test = _NORM_TESTS.get(method)
 
-def check_linearity_residuals(df: pd.DataFrame, target: str, feature: str) -> Tuple[np.ndarray, np.ndarray]:
-    """Fit linear model and return fitted values and residuals."""
-    data = df[[feature, target]].dropna()
-    X = data[feature].values.reshape(-1, 1)
-    y = data[target].values
+    results = {}
+    for col, count in counts.items():
+        if count < 3:
+            results[col] = {'error': 'Not enough data points'}
+        elif test is None:
+            results[col] = {'error': 'Unsupported method'}
+        else:
+            results[col] = test(df[col].dropna().to_numpy())
+    return results
+
+
+def _fit_line(x: np.ndarray, y: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Closed-form least squares for a single predictor; returns fitted values and residuals."""
+    x_mean, y_mean = x.mean(), y.mean()
+    dx = x - x_mean
+    sxx = (dx * dx).sum()
+    slope = (dx * (y - y_mean)).sum() / sxx if sxx else 0.0
+    intercept = y_mean - slope * x_mean
 
-    model = sm.OLS(y, sm.add_constant(X)).fit()
-    y_pred = model.predict(sm.add_constant(X))
+    y_pred = intercept + slope * x
     residuals = y - y_pred
 
     return y_pred, residuals
+
+
+def check_linearity_residuals(df: pd.DataFrame, target: str, feature: str) -> Tuple[np.ndarray, np.ndarray]:
+    """Fit linear model and return fitted values and residuals."""
+    data = df[[feature, target]].dropna()
+    x = data[feature].to_numpy(dtype=np.float64)
+    y = data[target].to_numpy(dtype=np.float64)
+    return _fit_line(x, y)
+
+
+def check_linearity_residuals_many(
+    df: pd.DataFrame,
+    target: str,
+    features: List[str]
+) -> Dict[str, Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+    """Fit a separate linear model of the target on each feature; returns fitted values, residuals and observed targets."""
+    # The target and every feature are converted to one float64 block up front;
+    # each fit then only slices the rows where both of its columns are present
+    values = df[[target, *features]].to_numpy(dtype=np.float64, na_value=np.nan)
+    y = values[:, 0]
+    y_present = ~np.isnan(y)
+
+    results = {}
+    for j, feature in enumerate(features, start=1):
+        keep = y_present & ~np.isnan(values[:, j])
+        y_used = y[keep]
+        results[feature] = (*_fit_line(values[keep, j], y_used), y_used)
+    return results
@@ -2,11 +2,60 @@
 import pandas as pd
 import re
 import numpy as np
-from typing import List, Dict, Tuple
+from typing import List, Dict, Tuple, Optional
 import warnings
 
+from .utils import numeric_block
 
-def drop_columns(df, cols):
+# Compiled once; also keeps Python's Unicode-aware \W when pandas strings are Arrow-backed
+_WORD_RE = re.compile(r'\W+')
+
+
+def _column_stats(reducer, values: np.ndarray) -> np.ndarray:
+    """Apply a nan-aware NumPy reducer column-wise, all-NaN columns yielding NaN."""
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)
+        return reducer(values, axis=0)
+
+
+def _numeric_fill_values(df: pd.DataFrame, reducer, frame_reducer: str) -> Dict[str, object]:
+    """
+    Fill value of every numeric column, for fillna.
+
+    Numbers are reduced on one float64 block, with each result cast back to
+    its column's NumPy float dtype so e.g. float32 columns stay float32.
+    Timedeltas are reduced by pandas (frame_reducer names the DataFrame
+    method) so their fill values stay timedeltas.
+    """
+    cols = df.select_dtypes(include='number').columns
+    is_timedelta = np.array([pd.api.types.is_timedelta64_dtype(dtype) for dtype in df.dtypes[cols]], dtype=bool)
+
+    numeric_cols, values = numeric_block(df[cols[~is_timedelta]])
+    fill_values = {
+        col: dtype.type(value) if isinstance(dtype, np.dtype) and dtype.kind == 'f' else value
+        for col, dtype, value in zip(numeric_cols, df.dtypes[numeric_cols], _column_stats(reducer, values))
+    }
+    if is_timedelta.any():
+        fill_values.update(getattr(df[cols[is_timedelta]], frame_reducer)())
+    return fill_values
+
+
+def drop_columns(df: pd.DataFrame, cols: List[str]) -> pd.DataFrame:
+    """
+    Drop columns from the DataFrame.
+
+    Returns a new frame rather than dropping in place, so frames shared through
+    the session (e.g. the raw data) are never modified. With Copy-on-Write
+    enabled (see streamlit_main_app.py; always on from pandas 3.0) the remaining
+    columns share their data with the input instead of being copied.
+
+    Args:
+        df: Input DataFrame
+        cols: Column names to remove
+
+    Returns:
+        DataFrame without the given columns
+    """
     return df.drop(columns=cols)
 
 def fill_missing(df: pd.DataFrame, method: str = 'mean', custom_value=None) -> pd.DataFrame:
@@ -19,36 +68,51 @@ def fill_missing(df: pd.DataFrame, method: str = 'mean', custom_value=None) -> p
         custom_value: Value to use when method='custom'
         
     Returns:
-        DataFrame with missing values filled
+        DataFrame with missing values filled (the input frame is not modified)
     """
-    df_filled = df.copy()
+    # Every branch below builds a new frame, so no upfront copy is needed
+    df_filled = df
     
     if method == 'mean':
         # Fill numeric columns with mean
-        numeric_cols = df_filled.select_dtypes(include=[np.number]).columns
-        df_filled[numeric_cols] = df_filled[numeric_cols].fillna(df_filled[numeric_cols].mean())
+        df_filled = df_filled.fillna(_numeric_fill_values(df_filled, np.nanmean, 'mean'))
         
     elif method == 'median':
         # Fill numeric columns with median
-        numeric_cols = df_filled.select_dtypes(include=[np.number]).columns
-        df_filled[numeric_cols] = df_filled[numeric_cols].fillna(df_filled[numeric_cols].median())
+        df_filled = df_filled.fillna(_numeric_fill_values(df_filled, np.nanmedian, 'median'))
         
     elif method == 'mode':
-        # Fill all columns with mode
+        # Fill all columns with mode (columns without a mode stay untouched). Modes
+        # are taken per column: df.mode() pads every column to the longest mode
+        # list, which for an ID column is as long as the data
+        modes = {}
         for col in df_filled.columns:
-            mode_value = df_filled[col].mode()
-            if not mode_value.empty:
-                df_filled[col] = df_filled[col].fillna(mode_value[0])
+            mode = df_filled[col].mode(dropna=True)
+            if not mode.empty:
+                modes[col] = mode.iat[0]
+        df_filled = df_filled.fillna(modes)
                 
     elif method == 'ffill':
         # Forward fill
-        df_filled = df_filled.fillna(method='ffill')
+        df_filled = df_filled.ffill()
         
     elif method == 'bfill':
         # Backward fill
-        df_filled = df_filled.fillna(method='bfill')
+        df_filled = df_filled.bfill()
         
     elif method == 'custom':
+        # Categorical columns only accept known categories, so the fill value is
+        # added to those that have gaps to fill
+        add_to = [
+            i for i, dtype in enumerate(df_filled.dtypes)
+            if isinstance(dtype, pd.CategoricalDtype)
+            and custom_value not in dtype.categories
+            and df_filled.iloc[:, i].hasnans
+        ]
+        if add_to:
+            df_filled = df_filled.copy(deep=False)
+            for i in add_to:
+                df_filled.isetitem(i, df_filled.iloc[:, i].cat.add_categories([custom_value]))
         # Fill with custom value
         df_filled = df_filled.fillna(value=custom_value)  # Note: use 'value' parameter
         
@@ -64,7 +128,8 @@ def convert_type(df: pd.DataFrame, col: str, dtype: str):
 def handle_inf_values(
     df: pd.DataFrame,
     convert_to_nan: bool = True,
-    log_inf_locations: bool = False
+    log_inf_locations: bool = False,
+    inf_mask: Optional[np.ndarray] = None
 ) -> pd.DataFrame:
     """
     Handle infinite values (inf, -inf) in the DataFrame.
@@ -73,15 +138,23 @@ def handle_inf_values(
         df: Input DataFrame
         convert_to_nan: If True, replace inf with NaN. If False, cap with max/min finite values.
         log_inf_locations: If True, print locations (row, col) of infinite values.
+        inf_mask: Optional np.isinf mask of the numeric columns (as returned by numeric_block),
+            reused instead of scanning the frame again.
 
     Returns:
-        pd.DataFrame: Cleaned DataFrame
+        pd.DataFrame: Cleaned DataFrame (the input frame is not modified)
     """
-    df = df.copy()
-
-    # Find infinite values
-    inf_mask = np.isinf(df.select_dtypes(include=[np.number]))
-    num_inf = inf_mask.sum().sum()
+    # Find infinite values on the numeric ndarray (the mask is computed once and reused below)
+    if inf_mask is None:
+        numeric_cols, values = numeric_block(df)
+        inf_mask = np.isinf(values)
+    else:
+        numeric_cols, values = df.select_dtypes(include='number').columns, None
+        if inf_mask.shape != (len(df), len(numeric_cols)):
+            raise ValueError(
+                f"inf_mask has shape {inf_mask.shape}, expected {(len(df), len(numeric_cols))}"
+            )
+    num_inf = int(inf_mask.sum())
 
     if num_inf == 0:
         if log_inf_locations:
@@ -89,72 +162,118 @@ def handle_inf_values(
         return df
 
     if log_inf_locations:
-        inf_locations = df[inf_mask.any(axis=1)].index[inf_mask.any(axis=1)]
+        inf_locations = df.index[inf_mask.any(axis=1)]
         print(f"Infinite values found in rows: {inf_locations.tolist()}")
 
+    # Only columns that contain inf are repaired
+    affected = np.flatnonzero(inf_mask.any(axis=0))
+    affected_cols = numeric_cols[affected]
+    if values is None:
+        values = df[affected_cols].to_numpy(dtype=np.float64, na_value=np.nan)
+    else:
+        values = values[:, affected]
+    inf_mask = inf_mask[:, affected]
+
     # Replace based on strategy
     if convert_to_nan:
-        df = df.replace([np.inf, -np.inf], np.nan)
+        repaired = np.where(inf_mask, np.nan, values)
         if log_inf_locations:
             print(f"Replaced {num_inf} infinite values with NaN.")
     else:
-        # Cap with finite max/min
-        numeric_cols = df.select_dtypes(include=[np.number]).columns
-        for col in numeric_cols:
-            if inf_mask[col].any():
-                finite_max = df[col].replace([np.inf, -np.inf], np.nan).max()
-                finite_min = df[col].replace([np.inf, -np.inf], np.nan).min()
-                df[col] = df[col].replace(np.inf, finite_max)
-                df[col] = df[col].replace(-np.inf, finite_min)
+        # Cap with finite max/min, computed for every affected column in one sweep
+        finite = np.where(inf_mask, np.nan, values)
+        col_max = _column_stats(np.nanmax, finite)
+        col_min = _column_stats(np.nanmin, finite)
+        # Finite values already lie within [min, max], so clipping only moves the infinities
+        repaired = np.clip(values, col_min, col_max)
+
+    # Repaired columns keep their dtype; the shallow copy shares the untouched
+    # columns with the input frame
+    df = df.copy(deep=False)
+    for j, col in enumerate(affected_cols):
+        df[col] = pd.array(repaired[:, j], dtype=df[col].dtype)
 
     return df
 
 def clean_column_names(df: pd.DataFrame) -> Tuple[pd.DataFrame, Dict[str, str], Dict[str, str]]:
     """Clean column names to be valid Python identifiers and avoid formula errors."""
-    column_mapping = {}
-    used_names = set()
+    names = df.columns.astype(str).str.strip().str.replace(_WORD_RE, '_', regex=True)
+    names = names.where(~names.str[:1].str.isdigit(), '_' + names)
+    names = names.where(names != '', 'col_' + pd.RangeIndex(len(names)).astype(str))
+
+    # Ensure uniqueness: suffix repeated names with their occurrence number,
+    # falling back to a sequential scan if a suffix collides with another name
+    if not names.is_unique:
+        occurrence = names.to_series().groupby(names).cumcount().to_numpy()
+        suffixed = names.where(occurrence == 0, names + '_' + occurrence.astype(str))
+        names = suffixed if suffixed.is_unique else pd.Index(_dedupe_names(names))
+
+    df_clean = df.copy()
+    df_clean.columns = names
+    column_mapping = dict(zip(df.columns, names))
+    reverse_mapping = {v: k for k, v in column_mapping.items()}
+
+    return df_clean, column_mapping, reverse_mapping
 
-    for i, col in enumerate(df.columns):
-        name = re.sub(r'\W+', '_', str(col).strip())
-        name = f'_{name}' if name and name[0].isdigit() else name or f'col_{i}'
 
-        # Ensure uniqueness
+def _dedupe_names(names) -> List[str]:
+    """Make names unique by appending the first free '_<n>' suffix, in order."""
+    used_names = set()
+    unique_names = []
+    for name in names:
         base = name
         counter = 1
         while name in used_names:
             name = f"{base}_{counter}"
             counter += 1
-
-        column_mapping[col] = name
         used_names.add(name)
-
-    df_clean = df.copy()
-    df_clean.columns = list(column_mapping.values())
-    reverse_mapping = {v: k for k, v in column_mapping.items()}
-
-    return df_clean, column_mapping, reverse_mapping
+        unique_names.append(name)
+    return unique_names
 
 
 def is_suitable_categorical(series: pd.Series, max_unique_ratio: float = 0.05, max_unique_count: int = 20) -> bool:
     """Check if a series is suitable for categorical analysis."""
-    if series.empty or series.dropna().empty:
+    count = series.count()
+    if count == 0:
         return False
 
     if not pd.api.types.is_numeric_dtype(series):
         return True
 
+    # A column can't hold more distinct values than non-missing ones, so short
+    # columns pass without hashing them
+    if count <= max_unique_count:
+        return True
+
     unique_count = series.nunique(dropna=True)
-    unique_ratio = unique_count / len(series.dropna())
+    unique_ratio = unique_count / count
 
     return unique_count <= max_unique_count or unique_ratio <= max_unique_ratio
 
 
-def get_categorical_columns(df: pd.DataFrame, exclude: List[str] = []) -> List[str]:
+def get_categorical_columns(
+    df: pd.DataFrame,
+    exclude: List[str] = [],
+    max_unique_ratio: float = 0.05,
+    max_unique_count: int = 20
+) -> List[str]:
     """Return column names suitable for categorical analysis, excluding specified ones."""
-    return [
-        col for col in df.columns
-        if col not in exclude and is_suitable_categorical(df[col])
-    ]
+    # Same rule as is_suitable_categorical, evaluated for every column at once
+    exclude = set(exclude)
+    counts = df.count().to_numpy()
+    is_num = np.array([pd.api.types.is_numeric_dtype(dtype) for dtype in df.dtypes], dtype=bool)
+
+    # Only numeric columns with more values than max_unique_count need their distinct values counted
+    unique_counts = np.minimum(counts, max_unique_count).astype(float)
+    to_count = np.flatnonzero(is_num & (counts > max_unique_count))
+    if len(to_count):
+        unique_counts[to_count] = df.iloc[:, to_count].nunique(dropna=True).to_numpy()
+    unique_ratio = unique_counts / np.maximum(counts, 1)
+
+    suitable = (counts > 0) & (
+        ~is_num | (unique_counts <= max_unique_count) | (unique_ratio <= max_unique_ratio)
+    )
+    return [col for col, ok in zip(df.columns, suitable) if ok and col not in exclude]
 
 
 def prepare_dataframe_for_analysis(df: pd.DataFrame, target: str = None) -> pd.DataFrame:
@@ -169,12 +288,12 @@ def clean_dataframe_comprehensive(df: pd.DataFrame) -> pd.DataFrame:
     """Drop empty rows/columns and ensure column name uniqueness."""
     df_clean = df.dropna(how='all').dropna(axis=1, how='all')
 
-    if df_clean.columns.duplicated().any():
-        cols = pd.Series(df_clean.columns)
-        for dup in cols[cols.duplicated()].unique():
-            dup_indices = cols[cols == dup].index
-            cols.loc[dup_indices] = [f"{dup}_{i}" if i else dup for i in range(len(dup_indices))]
-        df_clean.columns = cols
+    cols = df_clean.columns
+    if cols.has_duplicates:
+        # Suffix every repeat with its occurrence number in a single pass
+        occurrence = cols.to_series().groupby(cols, dropna=False).cumcount().to_numpy()
+        suffixed = cols.astype(str) + '_' + occurrence.astype(str)
+        df_clean.columns = np.where(occurrence == 0, cols.to_numpy(dtype=object), suffixed.to_numpy(dtype=object))
 
     return df_clean
 
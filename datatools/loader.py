@@ -1,12 +1,119 @@
 # loader.py
+import importlib.util
+
 import pandas as pd
 
-def load_dataframe(file, filetype='csv', sep=','):
+_HAS_PYARROW = importlib.util.find_spec('pyarrow') is not None
+
+
+def reduce_mem_usage(df: pd.DataFrame, category_ratio: float = 0.5) -> pd.DataFrame:
+    """
+    Shrink a DataFrame's memory footprint by downcasting its dtypes.
+
+    Integers are downcast to the smallest (unsigned when non-negative) type that
+    fits, floats to float32 when no precision is lost, and text columns with
+    few distinct values are converted to 'category'.
+
+    Args:
+        df: Input DataFrame
+        category_ratio: Text columns whose unique/row ratio is below this become categorical
+
+    Returns:
+        DataFrame with optimized dtypes
+    """
+    df = df.copy(deep=False)
+    n_rows = len(df)
+
+    for col, dtype in df.dtypes.items():
+        if pd.api.types.is_bool_dtype(dtype):
+            continue
+        if pd.api.types.is_integer_dtype(dtype):
+            col_min = df[col].min()
+            downcast = 'unsigned' if pd.notna(col_min) and col_min >= 0 else 'integer'
+            df[col] = pd.to_numeric(df[col], downcast=downcast)
+        elif pd.api.types.is_float_dtype(dtype):
+            # to_numeric only checks closeness, so require an exact round trip
+            downcast = pd.to_numeric(df[col], downcast='float')
+            if downcast.dtype != dtype and downcast.astype(dtype).equals(df[col]):
+                df[col] = downcast
+        elif pd.api.types.is_string_dtype(dtype) and n_rows:
+            # Object columns can also hold lists or dicts (e.g. from JSON), which can't be hashed
+            if dtype == object and pd.api.types.infer_dtype(df[col], skipna=True) != 'string':
+                continue
+            if df[col].nunique() / n_rows < category_ratio:
+                df[col] = df[col].astype('category')
+
+    return df
+
+
+def to_arrow_strings(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Store text held in object columns as pyarrow-backed strings.
+
+    Arrow strings live in contiguous buffers instead of one Python object per
+    cell, so duplicated(), groupby() and value_counts() run on Arrow kernels.
+    Object columns mixing text with other values are left alone, as is
+    everything when pyarrow is not installed.
+
+    Args:
+        df: Input DataFrame
+
+    Returns:
+        DataFrame with text columns as 'string[pyarrow]'
+    """
+    if not _HAS_PYARROW:
+        return df
+
+    df = df.copy(deep=False)
+    for col, dtype in df.dtypes.items():
+        if dtype == object and pd.api.types.infer_dtype(df[col], skipna=True) == 'string':
+            df[col] = df[col].astype('string[pyarrow]')
+
+    return df
+
+
+def _has_binary_columns(df: pd.DataFrame) -> bool:
+    """True if any object column holds bytes, as the pyarrow reader returns for undecodable text."""
+    return any(
+        dtype == object and pd.api.types.infer_dtype(df[col], skipna=True) == 'bytes'
+        for col, dtype in df.dtypes.items()
+    )
+
+
+def load_dataframe(file, filetype='csv', sep=',', optimize_dtypes=False, use_pyarrow=True):
+    """
+    Read a CSV, Excel or JSON file into a DataFrame.
+
+    CSV files are parsed with the multi-threaded pyarrow engine when it is
+    installed and the separator is a single character. That engine returns
+    date-only columns as datetime.date objects (object dtype) where the
+    default engine keeps the text. Files that are not valid UTF-8 are re-read
+    with the default engine, so they raise UnicodeDecodeError as before
+    instead of yielding bytes.
+
+    Args:
+        file: Path or file-like object
+        filetype: 'csv', 'excel'/'xlsx' or 'json'
+        sep: CSV field separator
+        optimize_dtypes: If True, pass the result through reduce_mem_usage
+        use_pyarrow: Allow the pyarrow CSV engine
+
+    Returns:
+        Loaded DataFrame
+    """
     if filetype == 'csv':
-        return pd.read_csv(file, sep=sep)
+        # The pyarrow engine parses multi-threaded but only takes single-character separators
+        engine = 'pyarrow' if use_pyarrow and _HAS_PYARROW and len(sep) == 1 else None
+        df = pd.read_csv(file, sep=sep, engine=engine)
+        if engine == 'pyarrow' and _has_binary_columns(df):
+            if hasattr(file, 'seek'):
+                file.seek(0)
+            df = pd.read_csv(file, sep=sep)
     elif filetype == 'excel' or filetype == 'xlsx':
-        return pd.read_excel(file)
+        df = pd.read_excel(file)
     elif filetype == 'json':
-        return pd.read_json(file)
+        df = pd.read_json(file)
     else:
-        raise ValueError("Unsupported file type")
\ No newline at end of file
+        raise ValueError("Unsupported file type")
+
+    return reduce_mem_usage(df) if optimize_dtypes else df
@@ -6,9 +6,12 @@ This module contains:
 - Streamlit-specific tools (code logging, session reset)
 """
 
+import io
+
 import streamlit as st
 import pandas as pd
-from typing import List, Optional, Any
+import numpy as np
+from typing import List, Optional, Any, Tuple, Callable
 
 # =============================================================================
 # 🔧 DATA UTILITIES
@@ -25,8 +28,47 @@ def list_numeric_columns(df: pd.DataFrame) -> List[str]:
 
 
 def list_categorical_columns(df: pd.DataFrame) -> List[str]:
-    """Return list of categorical (object/category) column names."""
-    return df.select_dtypes(include=['object', 'category']).columns.tolist()
+    """Return list of categorical (object/category/string) column names."""
+    return df.select_dtypes(include=['object', 'category', 'string']).columns.tolist()
+
+
+def numeric_block(df: pd.DataFrame) -> Tuple[pd.Index, np.ndarray]:
+    """
+    Return the numeric columns and their values as a single 2-D float array.
+
+    Missing values (including pd.NA) come back as NaN, so the array can be
+    passed straight to NumPy's nan-aware reductions.
+
+    Args:
+        df: Input DataFrame
+
+    Returns:
+        Tuple of (numeric column Index, float64 array of shape (rows, numeric columns))
+    """
+    cols = df.select_dtypes(include='number').columns
+    return cols, df[cols].to_numpy(dtype=np.float64, na_value=np.nan)
+
+
+def sample_for_plot(df: pd.DataFrame, max_n: int = 10000, seed: int = 0) -> pd.DataFrame:
+    """
+    Return at most max_n rows of df for plotting.
+
+    Frames with more rows are replaced by a random sample. The seed makes the
+    sample the same on every call, so plots stay stable across reruns.
+
+    Args:
+        df: Input DataFrame
+        max_n: Maximum number of rows to keep
+        seed: Random seed for the sample
+
+    Returns:
+        df itself, or a sample of max_n rows in their original order
+    """
+    if len(df) <= max_n:
+        return df
+    # Sample row positions rather than labels, so any index keeps its row order
+    positions = np.random.default_rng(seed).choice(len(df), max_n, replace=False)
+    return df.iloc[np.sort(positions)]
 
 
 def validate_column_in_df(df: pd.DataFrame, col: str, raise_error: bool = True) -> bool:
@@ -67,10 +109,59 @@ def safe_dropna(series: pd.Series) -> pd.Series:
     return series.dropna()
 
 
+_CUSTOM_LITERALS = {'true': True, 'false': False, 'none': None, 'null': None, 'nan': None}
+
+
+def parse_custom_value(text: str) -> Any:
+    """
+    Convert a value typed in the UI to the Python value it stands for.
+
+    'true'/'false' become booleans and 'none'/'null'/'nan' become None (case-insensitive).
+    Integers are parsed exactly, whatever their size; anything else pandas can
+    parse as a finite number becomes a float. Other text, including 'inf', is
+    kept as a string, without surrounding quotes.
+
+    Args:
+        text: Raw text from an input widget
+
+    Returns:
+        bool, None, int, float or str
+    """
+    val = text.strip()
+    if val.lower() in _CUSTOM_LITERALS:
+        return _CUSTOM_LITERALS[val.lower()]
+
+    try:
+        return int(val)
+    except ValueError:
+        pass
+
+    number = pd.to_numeric(pd.Series([val]), errors='coerce').iat[0]
+    # Infinities would be flagged as bad data by the inf check right after filling
+    if pd.isna(number) or np.isinf(number):
+        return val.strip('"\'')
+    return number.item()
+
+
 # =============================================================================
 # 🖥️ STREAMLIT UI UTILITIES
 # =============================================================================
 
+def init_code_log(header: str = "# Data Processing Log") -> None:
+    """
+    Start a fresh code log in the session state.
+
+    The log is an in-memory text buffer, so appending a line and rendering
+    the full script both stay linear in the size of the log.
+
+    Args:
+        header: Comment line written at the top of the log
+    """
+    buffer = io.StringIO()
+    buffer.write(header.strip() + "\n")
+    st.session_state['code_log'] = buffer
+
+
 def log_code(code_line: str) -> None:
     """
     Append a line of executable Python code to the session state log.
@@ -82,8 +173,8 @@ def log_code(code_line: str) -> None:
         code_line: A string containing valid Python code (e.g., "df = df.drop(columns=['age'])")
     """
     if 'code_log' not in st.session_state:
-        st.session_state['code_log'] = ["# Data Processing Log\n"]
-    st.session_state['code_log'].append(code_line.strip())
+        init_code_log()
+    st.session_state['code_log'].write(code_line.strip() + "\n")
 
 
 def reset_session() -> None:
@@ -94,15 +185,16 @@ def reset_session() -> None:
         - 'df': Current working DataFrame
         - 'df_raw': Original loaded DataFrame
         - 'code_log': Logged transformation code
+        - 'df_cache': Results cached per DataFrame
 
     Re-initializes code log for new session.
     """
-    keys_to_clear = ['df', 'df_raw', 'code_log']
+    keys_to_clear = ['df', 'df_raw', 'code_log', 'df_cache']
     for key in keys_to_clear:
         if key in st.session_state:
             del st.session_state[key]
     # Re-init code log
-    st.session_state['code_log'] = ["# New session started\n"]
+    init_code_log("# New session started")
 
 
 def get_code_string() -> str:
@@ -114,7 +206,78 @@ def get_code_string() -> str:
     Returns:
         Multi-line string of Python code
     """
-    return "\n".join(st.session_state.get('code_log', ['# No code logged']))
+    code_log = st.session_state.get('code_log')
+    return code_log.getvalue() if code_log is not None else '# No code logged'
+
+
+def cached_for_df(key: str, df: pd.DataFrame, compute: Callable[[pd.DataFrame], Any]) -> Any:
+    """
+    Return compute(df), reusing the stored result while the session holds the same DataFrame.
+
+    The cache holds results for a single DataFrame at a time: passing a
+    different object clears every stored result, so a replaced frame is not
+    kept alive by the cache. Pages replace st.session_state['df'] rather than
+    editing it in place, so an identity check is enough to detect changes.
+
+    Args:
+        key: Name of the cached result
+        df: DataFrame the result is derived from
+        compute: Function building the result from df
+
+    Returns:
+        The cached or freshly computed result
+    """
+    cache = st.session_state.get('df_cache')
+    if cache is None or cache['df'] is not df:
+        cache = {'df': df, 'values': {}}
+        st.session_state['df_cache'] = cache
+    values = cache['values']
+    if key not in values:
+        values[key] = compute(df)
+    return values[key]
+
+
+def get_duplicated_mask(df: pd.DataFrame) -> pd.Series:
+    """Boolean mask of duplicated rows, hashed once per DataFrame (used by the Explore page's summary)."""
+    return cached_for_df('duplicated_mask', df, lambda frame: frame.duplicated())
+
+
+def columns_info(df: pd.DataFrame) -> dict:
+    """
+    Column names of df grouped by kind, built once per DataFrame for the page widgets.
+
+    Args:
+        df: Input DataFrame
+
+    Returns:
+        Dict with 'all', 'numeric' and 'categorical' tuples of column names
+    """
+    return cached_for_df('columns_info', df, lambda frame: {
+        'all': tuple(frame.columns),
+        'numeric': tuple(list_numeric_columns(frame)),
+        'categorical': tuple(list_categorical_columns(frame)),
+    })
+
+
+def count_duplicate_rows(df: pd.DataFrame) -> int:
+    """
+    Count duplicated rows from one 64-bit hash per row, cached per DataFrame.
+
+    Cheaper than df.duplicated() for a quick preview. The count can only differ
+    from df.duplicated().sum() on a hash collision or on rows that differ only
+    by 0.0 vs -0.0.
+
+    Args:
+        df: Input DataFrame
+
+    Returns:
+        Number of rows repeating an earlier row
+    """
+    def _count(frame: pd.DataFrame) -> int:
+        hashes = pd.util.hash_pandas_object(frame, index=False)
+        return len(hashes) - hashes.nunique()
+
+    return cached_for_df('duplicate_count', df, _count)
 
 
 def download_code_button(filename: str = "data_processing_script.py") -> None:
@@ -134,6 +297,25 @@ def download_code_button(filename: str = "data_processing_script.py") -> None:
     )
 
 
+def figure_to_png(fig) -> bytes:
+    """
+    Render a matplotlib Figure to PNG bytes with st.pyplot's default options.
+
+    Cached plots store these bytes rather than the Figure: a cached Figure is
+    shared by every session, and matplotlib figures can't be drawn from
+    several script threads at once.
+
+    Args:
+        fig: matplotlib Figure
+
+    Returns:
+        PNG image, for st.image
+    """
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format='png', dpi=200, bbox_inches='tight')
+    return buffer.getvalue()
+
+
 # =============================================================================
 # 🛠️ MISC HELPERS
 # =============================================================================
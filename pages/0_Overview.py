@@ -1,6 +1,7 @@
 # pages/0_Overview.py
 import streamlit as st
 import pandas as pd
+from datatools.utils import get_code_string, columns_info
 
 st.header("🏠 Welcome to My Data Tool")
 st.markdown("""
@@ -18,14 +19,16 @@ if 'df' in st.session_state and st.session_state['df'] is not None:
     df = st.session_state['df']
     st.subheader("📊 Current Dataset")
     st.write(f"Rows: {len(df)} | Columns: {len(df.columns)} | Memory: {df.memory_usage(deep=True).sum() / 1e6:.2f} MB")
-    st.write(f"Numerical: {len(df.select_dtypes(include='number').columns)} | Categorical: {len(df.select_dtypes(include='object').columns)}")
+    cols = columns_info(df)
+    st.write(f"Numerical: {len(cols['numeric'])} | Categorical: {len(cols['categorical'])}")
 
     st.dataframe(df.head())
 
-# Show recent actions
-if 'code_log' in st.session_state and len(st.session_state['code_log']) > 1:
+# Show recent actions (everything logged after the header line)
+_, _, recent_actions = get_code_string().partition("\n")
+if recent_actions.strip():
     st.subheader("📝 Recent Actions")
-    st.code("\n".join(st.session_state['code_log'][1:]), language="python")
+    st.code(recent_actions, language="python")
 
 # Feature overview
 st.subheader("🛠️ Features by Module")
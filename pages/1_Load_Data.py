@@ -1,7 +1,7 @@
 # pages/1_Load_Data.py
 import streamlit as st
 import pandas as pd
-from datatools.loader import load_dataframe
+from datatools.loader import load_dataframe, to_arrow_strings
 from datatools.utils import log_code, reset_session, download_code_button
 
 st.header("📁 Load Data")
@@ -21,6 +21,10 @@ if uploaded_file is not None:
     else:
         df = load_dataframe(uploaded_file, filetype=file_type)
 
+    # Sidebar option: keep text columns in Arrow buffers for faster string operations
+    if st.session_state.get('use_arrow_strings'):
+        df = to_arrow_strings(df)
+
     st.success("✅ File loaded successfully!")
 
     st.subheader("First few rows:")
@@ -2,6 +2,7 @@
 import streamlit as st
 import numpy as np
 from datatools.analyzer import generate_column_info, summarize_dataset
+from datatools.utils import get_duplicated_mask
 
 st.header("🔍 Explore Data")
 st.markdown("Automated EDA report of your dataset.")
@@ -17,7 +18,7 @@ if 'df' in st.session_state:
     st.dataframe(column_info)
 
     st.subheader("🧾 Dataset Summary")
-    summary = summarize_dataset(df)
+    summary = summarize_dataset(df, dup_mask=get_duplicated_mask(df))
     summary_clean = {k: int(v) if isinstance(v, (np.integer, np.int64, np.floating, np.float64)) else v for k, v in summary.items()}
     st.json(summary_clean)
     #st.table(summary)
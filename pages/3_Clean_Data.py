@@ -5,7 +5,11 @@ import numpy as np
 
 # Import from core library
 from datatools.cleaner import drop_columns, fill_missing, remove_duplicates, handle_inf_values
-from datatools.utils import log_code, list_numeric_columns, list_categorical_columns
+from datatools.loader import reduce_mem_usage
+from datatools.utils import (
+    log_code, columns_info, count_duplicate_rows, cached_for_df,
+    numeric_block, parse_custom_value
+)
 
 st.header("🧹 Clean Data")
 st.markdown("Apply common data cleaning steps interactively. All actions are logged for reproducibility.")
@@ -15,10 +19,32 @@ if 'df' not in st.session_state or st.session_state['df'] is None:
     st.warning("Please upload a dataset in the 'Load Data' tab first.")
     st.stop()
 
-df = st.session_state['df'].copy()
+# No copy: every action below builds a new frame and never edits this one in place
+df = st.session_state['df']
 
-# Keep a flag to track if any change was made
+# Keep a flag to track if any change was made; the session state is written once, at the end
 changes_made = False
+rerun_after_save = False
+
+# ===========================
+# Optimize Memory
+# ===========================
+st.subheader("💾 Optimize Memory")
+if st.checkbox("Optimize memory (categoricals + downcast)", help="Downcast numeric columns and store repetitive text columns as categories"):
+    keep_text = st.checkbox(
+        "Keep text columns as text",
+        help="Only downcast numbers. Useful if text columns are used as groups on the Feature vs Target page."
+    )
+    category_ratio = 0.0 if keep_text else 0.5
+
+    if st.button("Apply: Optimize Memory"):
+        mem_before = df.memory_usage(deep=True).sum()
+        df = reduce_mem_usage(df, category_ratio=category_ratio)
+        mem_after = df.memory_usage(deep=True).sum()
+        log_code("from datatools import reduce_mem_usage")
+        log_code(f"df = reduce_mem_usage(df, category_ratio={category_ratio})")
+        st.success(f"✅ Memory usage reduced from {mem_before / 1e6:.2f} MB to {mem_after / 1e6:.2f} MB")
+        changes_made = True
 
 # ===========================
 # Drop Columns
@@ -26,14 +52,13 @@ changes_made = False
 st.subheader("🗑️ Drop Columns")
 cols_to_drop = st.multiselect(
     "Select columns to drop",
-    options=df.columns.tolist(),
+    options=columns_info(df)['all'],
     help="Choose one or more columns to remove from the dataset."
 )
 
 if cols_to_drop:
     if st.button("Apply: Drop Selected Columns"):
         df = drop_columns(df, cols_to_drop)
-        st.session_state['df'] = df
         log_code(f"df = df.drop(columns={cols_to_drop})")
         st.success(f"✅ Dropped columns: `{', '.join(cols_to_drop)}`")
         changes_made = True
@@ -80,20 +105,10 @@ if st.button(f"Apply: Fill Missing with {missing_method}") and missing_method !=
             # Handle custom value conversion
             converted_value = None
             if missing_method == "Custom Value" and custom_value is not None:
-                val = custom_value.strip()
-                if val.lower() in ['true', 'false']:
-                    converted_value = val.lower() == 'true'
-                elif val.lower() in ['none', 'null', 'nan']:
-                    converted_value = None
-                else:
-                    try:
-                        converted_value = int(val) if '.' not in val else float(val)
-                    except ValueError:
-                        converted_value = val  # Keep as string
+                converted_value = parse_custom_value(custom_value)
 
             # Apply filling
             df = fill_missing(df, method=method, custom_value=converted_value)
-            st.session_state['df'] = df
 
             # Success message
             if missing_method == "Custom Value":
@@ -117,8 +132,13 @@ Detect and handle `inf` or `-inf` values.
 inf_action = "Skip for now"
 
 if st.checkbox("🔍 Check for Infinite Values", help="Scan numerical columns for `inf` or `-inf` values"):
-    numeric_df = df.select_dtypes(include=[np.number])
-    has_inf = np.isinf(numeric_df).values.any()
+    # The inf mask is computed once per frame and handed to handle_inf_values, so
+    # detection and repair share a single scan of the numeric columns
+    numeric_cols = columns_info(df)['numeric']
+    inf_mask = cached_for_df('inf_mask', df, lambda frame: np.isinf(numeric_block(frame)[1]))
+    # Per-column flags, reused for the overall check and for picking the capped columns
+    col_has_inf = inf_mask.any(axis=0)
+    has_inf = col_has_inf.any()
 
     if has_inf:
         st.warning("⚠️ Infinite values (`inf`, `-inf`) detected in numerical columns.")
@@ -131,30 +151,30 @@ if st.checkbox("🔍 Check for Infinite Values", help="Scan numerical columns fo
 
         if st.button("Apply: Handle Infinite Values"):
             if inf_action == "Replace with NaN":
-                df = handle_inf_values(df, convert_to_nan=True, log_inf_locations=True)
+                df = handle_inf_values(df, convert_to_nan=True, log_inf_locations=True, inf_mask=inf_mask)
                 log_code("df = df.replace([np.inf, -np.inf], np.nan)")
                 st.success("✅ Replaced `inf` and `-inf` with `NaN`.")
                 changes_made = True
 
             elif inf_action == "Cap with max/min finite values":
-                # Keep original for logging before mutation
-                df_orig = df.copy()
-                df = handle_inf_values(df, convert_to_nan=False, log_inf_locations=True)
-
-                numeric_cols = df.select_dtypes(include=[np.number]).columns
-                for col in numeric_cols:
-                    if np.isinf(df_orig[col]).any():
-                        clean_series = df_orig[col].replace([np.inf, -np.inf], np.nan)
-                        finite_max = clean_series.max()
-                        finite_min = clean_series.min()
-                        log_code(f"# Capped inf values in '{col}' with finite max={finite_max:.2f}, min={finite_min:.2f}")
+                df = handle_inf_values(df, convert_to_nan=False, log_inf_locations=True, inf_mask=inf_mask)
+
+                # Capped columns now hold their finite extrema at the former infinities
+                capped_cols = pd.Index(numeric_cols)[col_has_inf]
+                # pandas reductions skip NaN without warning on columns that were all inf/NaN
+                capped = df[capped_cols]
+                for col, finite_max, finite_min in zip(
+                    capped_cols,
+                    capped.max().to_numpy(),
+                    capped.min().to_numpy()
+                ):
+                    log_code(f"# Capped inf values in '{col}' with finite max={finite_max:.2f}, min={finite_min:.2f}")
                 st.success("✅ Capped `inf` and `-inf` with finite extrema.")
                 changes_made = True
 
-            # Save after apply
+            # Rerun after saving so the detection above reflects the handled data
             if changes_made:
-                st.session_state['df'] = df
-                st.rerun()
+                rerun_after_save = True
 
     else:
         st.success("✅ No infinite values found in numerical columns.")
@@ -164,7 +184,7 @@ if st.checkbox("🔍 Check for Infinite Values", help="Scan numerical columns fo
 # ===========================
 st.subheader("🧼 Remove Duplicate Rows")
 if st.checkbox("Preview duplicates", help="Show how many duplicate rows exist"):
-    dup_count = df.duplicated().sum()
+    dup_count = count_duplicate_rows(df)
     if dup_count > 0:
         st.info(f"Found {dup_count} duplicate row(s).")
     else:
@@ -174,7 +194,6 @@ if st.button("Remove All Duplicates"):
     original_count = len(df)
     df = remove_duplicates(df)
     new_count = len(df)
-    st.session_state['df'] = df
     log_code("df = df.drop_duplicates()")
     st.success(f"✅ Removed {original_count - new_count} duplicate(s). Now {new_count} rows.")
     changes_made = True
@@ -194,14 +213,14 @@ col1, col2 = st.columns(2)
 
 with col1:
     if st.button("🔄 Reset to Original Data"):
-        st.session_state['df'] = st.session_state['df_raw'].copy()
+        st.session_state['df'] = st.session_state['df_raw'].copy(deep=False)
         log_code("# Reset to original loaded data")
         st.success("DataFrame reset to original state.")
         st.rerun()
 
 with col2:
     if st.button("🧹 Clear All Changes"):
-        st.session_state['df'] = st.session_state['df_raw'].copy()
+        st.session_state['df'] = st.session_state['df_raw'].copy(deep=False)
         st.success("All changes cleared.")
         st.rerun()
 
@@ -210,3 +229,5 @@ with col2:
 # ===========================
 if changes_made:
     st.session_state['df'] = df
+    if rerun_after_save:
+        st.rerun()
@@ -2,11 +2,103 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
-import scipy.stats as stats
-import plotly.express as px
-import plotly.figure_factory as ff
+import warnings
+from datatools.utils import columns_info, figure_to_png, sample_for_plot
+
+# Plotting and stats libraries are imported in the branches that use them, so
+# the page only loads what the selected plot type needs
+
+
+def _finite_values(series: pd.Series) -> np.ndarray:
+    """Column values as a float array without NaN or inf."""
+    vals = series.to_numpy(dtype=np.float64, na_value=np.nan)
+    return vals[np.isfinite(vals)]
+
+
+# The curve computations are cached on the column values, so switching plot
+# type or selecting another column does not redo the sort/KDE for the others
+@st.cache_data
+def _qq_points(vals: np.ndarray):
+    """Theoretical vs ordered quantiles and the least-squares fit line."""
+    import scipy.stats as stats
+    (theoretical, ordered), (slope, intercept, _) = stats.probplot(vals, dist="norm")
+    return theoretical, ordered, slope, intercept
+
+
+@st.cache_data
+def _kde_curve(vals: np.ndarray, gridsize: int = 200, cut: float = 3):
+    """Gaussian KDE (Scott bandwidth) evaluated on a grid, as seaborn's kdeplot draws it."""
+    if vals.size < 2 or np.ptp(vals) == 0:
+        return np.array([]), np.array([])
+    import scipy.stats as stats
+    kde = stats.gaussian_kde(vals)
+    bw = kde.factor * vals.std(ddof=1)
+    x_grid = np.linspace(vals.min() - cut * bw, vals.max() + cut * bw, gridsize)
+    return x_grid, kde(x_grid)
+
+
+@st.cache_data
+def _ecdf_points(vals: np.ndarray):
+    """Sorted values and their cumulative proportions."""
+    x = np.sort(vals)
+    return x, np.arange(1, x.size + 1) / x.size
+
+
+@st.cache_data(max_entries=8)
+def _pair_grid(values: np.ndarray, columns: tuple, bins: int = 30) -> bytes:
+    """Corner pair grid as a PNG: histograms on the diagonal, scatter plots below it."""
+    from matplotlib.figure import Figure
+    k = len(columns)
+    fig = Figure(figsize=(2.5 * k, 2.5 * k))
+    axes = fig.subplots(k, k, squeeze=False)
+
+    finite = np.isfinite(values)
+    # Large scatters are drawn as a single image per subplot instead of one vector marker per point
+    rasterized = len(values) > 5000
+    for i in range(k):
+        for j in range(k):
+            ax = axes[i, j]
+            if j > i:
+                # The upper triangle mirrors the lower one, so it is not drawn
+                fig.delaxes(ax)
+                continue
+            if i == j:
+                col_vals = values[finite[:, i], i]
+                if col_vals.size:
+                    counts, edges = np.histogram(col_vals, bins=bins)
+                    ax.stairs(counts, edges, fill=True, alpha=0.7)
+            else:
+                keep = finite[:, i] & finite[:, j]
+                ax.scatter(values[keep, j], values[keep, i], s=6, alpha=0.5, rasterized=rasterized)
+            if i == k - 1:
+                ax.set_xlabel(columns[j])
+            if j == 0 and i > 0:
+                ax.set_ylabel(columns[i])
+
+    fig.tight_layout()
+    return figure_to_png(fig)
+
+
+@st.cache_data
+def _summary_stats(values: np.ndarray, columns: tuple) -> pd.DataFrame:
+    """Mean, median, std and skew of each column of values, matching pandas' NaN handling."""
+    import scipy.stats as stats
+    with warnings.catch_warnings():
+        # All-NaN and constant columns are expected here and come out as NaN/0 below
+        warnings.simplefilter('ignore', RuntimeWarning)
+        counts = np.count_nonzero(~np.isnan(values), axis=0)
+        std = np.nanstd(values, axis=0, ddof=1)
+        skew = stats.skew(values, axis=0, bias=False, nan_policy='omit')
+        # Like pandas: constant columns have zero skew, fewer than 3 values have none
+        skew = np.where(std == 0, 0.0, skew)
+        skew = np.where(counts < 3, np.nan, skew)
+        return pd.DataFrame({
+            'mean': np.nanmean(values, axis=0),
+            'median': np.nanmedian(values, axis=0),
+            'std': std,
+            'skew': skew
+        }, index=list(columns))
+
 
 st.header("📊 Analyze Distributions")
 st.markdown("Select features and visualize their distributions.")
@@ -14,7 +106,7 @@ st.markdown("Select features and visualize their distributions.")
 if 'df' in st.session_state:
     df = st.session_state['df']
 
-    numeric_cols = df.select_dtypes(include=np.number).columns.tolist()
+    numeric_cols = columns_info(df)['numeric']
     selected_cols = st.multiselect("Select one or more features", options=numeric_cols)
 
     if selected_cols:
@@ -27,44 +119,67 @@ if 'df' in st.session_state:
             "Pairwise Distribution"
         ])
 
+        # Plots are drawn from a fixed sample on large datasets; summary statistics use every row
+        plot_df = sample_for_plot(df[selected_cols], st.session_state.get('plot_sample_size', 10000))
+        if len(plot_df) < len(df):
+            st.caption(f"Plots use a random sample of {len(plot_df):,} out of {len(df):,} rows.")
+
         if plot_type == "Histogram":
+            import plotly.express as px
             for col in selected_cols:
-                fig = px.histogram(df, x=col, title=f"Histogram of {col}")
+                fig = px.histogram(plot_df, x=col, title=f"Histogram of {col}")
                 st.plotly_chart(fig)
 
         elif plot_type == "KDE Plot":
+            import matplotlib.pyplot as plt
             for col in selected_cols:
-                fig = sns.kdeplot(df[col])
+                x_grid, density = _kde_curve(_finite_values(plot_df[col]))
+                plt.plot(x_grid, density)
+                plt.xlabel(col)
+                plt.ylabel("Density")
                 plt.title(f"KDE Plot of {col}")
                 st.pyplot(plt)
                 plt.clf()
 
         elif plot_type == "ECDF Plot":
+            import matplotlib.pyplot as plt
             for col in selected_cols:
-                fig = sns.ecdfplot(df[col])
+                x, proportion = _ecdf_points(_finite_values(plot_df[col]))
+                plt.step(x, proportion, where="post")
+                plt.xlabel(col)
+                plt.ylabel("Proportion")
                 plt.title(f"ECDF Plot of {col}")
                 st.pyplot(plt)
                 plt.clf()
 
         elif plot_type == "Boxplot":
+            import plotly.express as px
             for col in selected_cols:
-                fig = px.box(df, y=col, title=f"Boxplot of {col}")
+                fig = px.box(plot_df, y=col, title=f"Boxplot of {col}")
                 st.plotly_chart(fig)
 
         elif plot_type == "QQ Plot":
+            import matplotlib.pyplot as plt
             for col in selected_cols:
-                fig = stats.probplot(df[col], dist="norm", plot=plt)
+                theoretical, ordered, slope, intercept = _qq_points(_finite_values(plot_df[col]))
+                plt.plot(theoretical, ordered, 'bo')
+                plt.plot(theoretical, slope * theoretical + intercept, 'r-')
+                plt.xlabel("Theoretical quantiles")
+                plt.ylabel("Ordered Values")
                 plt.title(f"QQ Plot of {col}")
                 st.pyplot(plt)
                 plt.clf()
 
         elif plot_type == "Pairwise Distribution":
-            fig = sns.pairplot(df[selected_cols])
-            st.pyplot(fig)
+            png = _pair_grid(
+                plot_df.to_numpy(dtype=np.float64, na_value=np.nan), tuple(selected_cols)
+            )
+            st.image(png)
 
         # Show summary stats
         st.subheader("📊 Summary Statistics")
-        stats_df = df[selected_cols].agg(['mean', 'median', 'std', 'skew']).T
+        values = df[selected_cols].to_numpy(dtype=np.float64, na_value=np.nan)
+        stats_df = _summary_stats(values, tuple(selected_cols))
         st.dataframe(stats_df)
 
 else:
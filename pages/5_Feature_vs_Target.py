@@ -1,11 +1,48 @@
 # pages/8_Feature_vs_Target.py
 import streamlit as st
 import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
 import seaborn as sns
 import numpy as np
+import pandas as pd
 
 # Import utilities
-from datatools.utils import list_numeric_columns, list_categorical_columns, validate_column_in_df
+from datatools.utils import columns_info, figure_to_png, validate_column_in_df
+
+
+
+@st.cache_data
+def _target_correlations(x_values: np.ndarray, y: np.ndarray) -> np.ndarray:
+    """Pearson correlation of each column of x_values with y, over rows where both are present."""
+    return pd.DataFrame(x_values).corrwith(pd.Series(y)).to_numpy()
+
+
+@st.cache_data(max_entries=8)
+def _scatter_grid(
+    x_values: np.ndarray, y: np.ndarray, columns: tuple, correlations: tuple, target: str, n_cols_grid: int
+) -> bytes:
+    """Grid of target-vs-feature scatter plots, one column of x_values per subplot, as a PNG."""
+    n_rows = (len(columns) + n_cols_grid - 1) // n_cols_grid
+    fig = Figure(figsize=(4 * n_cols_grid, 4 * n_rows))
+    axes = fig.subplots(n_rows, n_cols_grid, squeeze=False).ravel()
+
+    # Large scatters are drawn as a single image per subplot instead of one vector marker per point
+    rasterized = len(y) > 5000
+    for i, (col, r) in enumerate(zip(columns, correlations)):
+        axes[i].scatter(x_values[:, i], y, s=12, alpha=0.7, rasterized=rasterized)
+        axes[i].set_title(f"{target} vs {col} (r = {r:.2f})", fontsize=10)
+        axes[i].set_xlabel(col, fontsize=9)
+        axes[i].set_ylabel(target, fontsize=9)
+        axes[i].tick_params(axis='x', labelrotation=45, labelsize=8)
+
+    # Hide unused subplots
+    for ax in axes[len(columns):]:
+        fig.delaxes(ax)
+
+    fig.suptitle(f'{target} vs Numerical Features', fontsize=16, fontweight='bold', y=0.98)
+    fig.tight_layout(rect=[0, 0, 1, 0.96])
+    return figure_to_png(fig)
+
 
 st.header("🎯 Feature vs Target Analysis")
 st.markdown("Visualize how each feature relates to the target variable.")
@@ -15,20 +52,22 @@ if 'df' not in st.session_state or st.session_state['df'] is None:
     st.stop()
 
 df = st.session_state['df']
+cols = columns_info(df)
 
 # Select target
 target = st.selectbox(
     "Select the target variable (Y)",
-    options=df.columns,
-    index=df.columns.tolist().index('SalePrice') if 'SalePrice' in df.columns else 0
+    options=cols['all'],
+    index=cols['all'].index('SalePrice') if 'SalePrice' in cols['all'] else 0
 )
 
 if not validate_column_in_df(df, target, raise_error=False):
     st.error("Target column not found.")
     st.stop()
 
-# Check if target is numeric
-if not np.issubdtype(df[target].dtype, np.number):
+# Check if target is numeric (categorical and Arrow dtypes can't go through np.issubdtype)
+target_dtype = df[target].dtype
+if not pd.api.types.is_numeric_dtype(target_dtype) or pd.api.types.is_bool_dtype(target_dtype):
     st.warning(f"Target '{target}' is not numeric. Consider using ANOVA instead.")
     st.stop()
 
@@ -38,29 +77,32 @@ if not np.issubdtype(df[target].dtype, np.number):
 st.subheader("🔢 Numerical Features vs Target")
 st.markdown(f"Scatter plots: `{target}` vs. numeric features")
 
-numerical_cols = [col for col in list_numeric_columns(df) if col != target]
+numerical_cols = [col for col in cols['numeric'] if col != target]
 
 if numerical_cols:
     n_cols_grid = st.slider("Number of columns in grid", 2, 6, 5)
-    n_rows = (len(numerical_cols) + n_cols_grid - 1) // n_cols_grid
-
-    fig, axes = plt.subplots(n_rows, n_cols_grid, figsize=(4 * n_cols_grid, 4 * n_rows))
-    axes = axes.flatten() if len(numerical_cols) > 1 else [axes]
-
-    for i, col in enumerate(numerical_cols):
-        sns.scatterplot(ax=axes[i], x=df[col], y=df[target], s=12, alpha=0.7)
-        axes[i].set_title(f"{target} vs {col}", fontsize=10)
-        axes[i].set_xlabel(col, fontsize=9)
-        axes[i].set_ylabel(target, fontsize=9)
-        axes[i].tick_params(axis='x', labelrotation=45, labelsize=8)
-
-    # Hide unused subplots
-    for i in range(len(numerical_cols), len(axes)):
-        fig.delaxes(axes[i])
 
-    plt.suptitle(f'{target} vs Numerical Features', fontsize=16, fontweight='bold', y=0.98)
-    plt.tight_layout(rect=[0, 0, 1, 0.96])
-    st.pyplot(fig)
+    # Values are extracted once; the figure is rebuilt only when data, target, selection or grid change
+    x_values = df[numerical_cols].to_numpy(dtype=np.float64, na_value=np.nan)
+    y = df[target].to_numpy(dtype=np.float64, na_value=np.nan)
+
+    # Strongest correlations first (undefined ones last), so the top K can be plotted alone
+    correlations = _target_correlations(x_values, y)
+    order = np.argsort(-np.nan_to_num(np.abs(correlations), nan=-1.0), kind='stable')
+    top_k = len(numerical_cols)
+    if len(numerical_cols) > 1:
+        top_k = st.slider(
+            "Show top K features (by |correlation| with the target)",
+            1, len(numerical_cols), min(len(numerical_cols), 20)
+        )
+    order = order[:top_k]
+
+    png = _scatter_grid(
+        x_values[:, order], y,
+        tuple(numerical_cols[i] for i in order), tuple(correlations[order]),
+        target, n_cols_grid
+    )
+    st.image(png)
 else:
     st.info("No numerical features found (excluding target).")
 
@@ -70,18 +112,33 @@ else:
 st.subheader("🏷️ Categorical Features vs Target")
 st.markdown(f"Bar plots: `{target}` vs. categorical features")
 
-categorical_cols = list_categorical_columns(df)
+categorical_cols = list(cols['categorical'])
 
 if categorical_cols:
     n_cols_grid = st.slider("Number of columns in grid (categorical)", 2, 6, 4)
     n_rows = (len(categorical_cols) + n_cols_grid - 1) // n_cols_grid
 
-    fig, axes = plt.subplots(n_rows, n_cols_grid, figsize=(4 * n_cols_grid, 4 * n_rows))
-    axes = axes.flatten() if len(categorical_cols) > 1 else [axes]
+    # Mean target per level for every categorical feature, from one groupby over a long
+    # frame; its helper column names are padded until they match no real column
+    used_names = set(categorical_cols) | {target}
+    feat_name, level_name = '_feature', '_level'
+    while feat_name in used_names:
+        feat_name = '_' + feat_name
+    while level_name in used_names:
+        level_name = '_' + level_name
+    long = df[categorical_cols + [target]].melt(id_vars=target, var_name=feat_name, value_name=level_name)
+    means = long.groupby([feat_name, level_name], sort=False, observed=True)[target].mean()
+    orders = {
+        feat: level_means.droplevel(feat_name).sort_values(ascending=False).index
+        for feat, level_means in means.groupby(level=feat_name, sort=False)
+    }
+
+    fig, axes = plt.subplots(n_rows, n_cols_grid, figsize=(4 * n_cols_grid, 4 * n_rows), squeeze=False)
+    axes = axes.ravel()
 
     for i, col in enumerate(categorical_cols):
         # Sort categories by mean target value for better readability
-        order = df.groupby(col)[target].mean().sort_values(ascending=False).index
+        order = orders.get(col, [])
         sns.barplot(ax=axes[i], x=df[col], y=df[target], order=order, palette="Blues_d")
         axes[i].set_title(f"{target} vs {col}", fontsize=10)
         axes[i].set_xlabel(col, fontsize=9)
@@ -3,8 +3,16 @@ import streamlit as st
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
-import seaborn as sns
-from sklearn.linear_model import LinearRegression
+from datatools.analyzer import check_linearity_residuals_many
+from datatools.utils import columns_info, sample_for_plot
+
+
+@st.cache_data
+def _lowess_curve(fitted: np.ndarray, residuals: np.ndarray):
+    """LOWESS trend of the residuals (as drawn by seaborn's residplot), cached across reruns."""
+    from statsmodels.nonparametric.smoothers_lowess import lowess
+    smoothed = lowess(residuals, fitted)
+    return smoothed[:, 0], smoothed[:, 1]
 
 st.header("📈 Check Linearity")
 st.markdown("Use residual plots to assess linearity between features and a target variable.")
@@ -12,39 +20,51 @@ st.markdown("Use residual plots to assess linearity between features and a targe
 if 'df' in st.session_state:
     df = st.session_state['df']
 
-    numeric_cols = df.select_dtypes(include=['int', 'float']).columns.tolist()
+    # Any numeric dtype, including downcast int8/float32 columns
+    numeric_cols = columns_info(df)['numeric']
     target = st.selectbox("Select target variable", options=numeric_cols)
 
     if target:
         X_cols = st.multiselect("Select predictor(s)", options=[c for c in numeric_cols if c != target])
 
         if X_cols:
-            # Fit model and plot residuals
+            # Closed-form least-squares fits on the rows where both columns are present,
+            # all taken from a single ndarray of the selected columns
+            fits = check_linearity_residuals_many(df, target, X_cols)
+
+            # Plot residuals for each predictor
             for x in X_cols:
                 st.subheader(f"Residual Plot: {x} → {target}")
 
-                # Drop NaNs
-                data = df[[x, target]].dropna()
-
-                # Fit linear regression
-                model = LinearRegression()
-                X = data[x].values.reshape(-1, 1)
-                y = data[target].values
-                model.fit(X, y)
-                y_pred = model.predict(X)
-                residuals = y - y_pred
+                y_pred, residuals, y = fits[x]
 
-                # Plot residuals
+                # Plot residuals with their LOWESS trend; large fits are plotted from a
+                # fixed sample, while the metrics below use every row
+                points = sample_for_plot(
+                    pd.DataFrame({'fitted': y_pred, 'residual': residuals}),
+                    st.session_state.get('plot_sample_size', 10000)
+                )
+                fitted_s = points['fitted'].to_numpy()
+                residual_s = points['residual'].to_numpy()
                 fig, ax = plt.subplots(figsize=(6, 4))
-                sns.residplot(x=y_pred, y=residuals, lowess=True, ax=ax, color='blue')
+                ax.scatter(fitted_s, residual_s, color='blue', alpha=0.8)
+                trend_x, trend_y = _lowess_curve(fitted_s, residual_s)
+                ax.plot(trend_x, trend_y, color='blue')
                 ax.set_xlabel("Fitted Values")
                 ax.set_ylabel("Residuals")
                 ax.set_title(f"Residual Plot for {x}")
                 ax.axhline(0, color='red', linestyle='--')
                 st.pyplot(fig)
+                plt.close(fig)
 
                 # Metrics
-                r2 = model.score(X, y)
+                ss_res = (residuals ** 2).sum()
+                ss_tot = ((y - y.mean()) ** 2).sum()
+                # A constant target has no variance to explain: a perfect fit scores 1, anything else 0
+                if ss_tot:
+                    r2 = 1 - ss_res / ss_tot
+                else:
+                    r2 = 1.0 if ss_res == 0 else 0.0
                 rmse = np.sqrt(np.mean(residuals**2))
                 st.caption(f"R²: {r2:.3f} | RMSE: {rmse:.3f}")
 
@@ -1,8 +1,14 @@
 # main_app.py
 import streamlit as st
 import pandas as pd
-from datatools.utils import log_code, reset_session, download_code_button
+from datatools.utils import log_code, reset_session, download_code_button, init_code_log, get_code_string
 import importlib.util
+import os
+
+# Copy-on-Write lets shallow copies share data until one side is modified
+# (always on from pandas 3.0, where the option is deprecated)
+if int(pd.__version__.split('.')[0]) < 3:
+    pd.set_option("mode.copy_on_write", True)
 
 # Initialize session state using utilities
 if 'df' not in st.session_state:
@@ -10,7 +16,14 @@ if 'df' not in st.session_state:
 if 'df_raw' not in st.session_state:
     st.session_state['df_raw'] = None
 if 'code_log' not in st.session_state:
-    st.session_state['code_log'] = ["# Data processing log\n"]
+    init_code_log("# Data processing log")
+
+@st.cache_resource(max_entries=32, show_spinner=False)
+def _compile_page(path: str, mtime: float):
+    """Compile a page once per file version; mtime in the key picks up edits."""
+    with open(path, encoding="utf-8") as f:
+        return compile(f.read(), path, 'exec')
+
 
 # Page config
 st.set_page_config(page_title="My Data Tool", layout="wide")
@@ -59,6 +72,20 @@ selection = st.sidebar.radio(
     key="nav_radio"
 )
 
+# Data options (applied when a file is loaded)
+st.sidebar.checkbox(
+    "Use Arrow backend for text columns",
+    key="use_arrow_strings",
+    help="Store text as pyarrow strings when loading a file: faster duplicates, groupby and value counts."
+)
+
+st.sidebar.slider(
+    "Plot sample size",
+    min_value=1000, max_value=100000, value=10000, step=1000,
+    key="plot_sample_size",
+    help="Larger datasets are plotted from a random sample of this many rows; statistics still use every row."
+)
+
 # Reset button
 st.sidebar.divider()
 if st.sidebar.button("🔁 Reset Session"):
@@ -67,14 +94,14 @@ if st.sidebar.button("🔁 Reset Session"):
 
 # Code Export Panel
 with st.sidebar.expander("📄 View & Export Code", expanded=True):
-    st.code(st.session_state.get('code_log', ['# No code']), language="python")
+    st.code(get_code_string(), language="python")
     download_code_button("my_data_processing.py")
 
 # Load the selected page
 try:
-    with open(pages[selection], encoding="utf-8") as f:
-        code = compile(f.read(), pages[selection], 'exec')
-        exec(code)
+    page_path = pages[selection]
+    code = _compile_page(page_path, os.path.getmtime(page_path))
+    exec(code)
 except FileNotFoundError:
     st.error(f"Page not found: {pages[selection]}")
     st.markdown("Make sure the file exists in the `pages/` folder.")
@@ -0,0 +1,40 @@
+import numpy as np
+import pandas as pd
+
+from datatools.cleaner import fill_missing
+from datatools.loader import reduce_mem_usage
+
+
+def test_custom_fill_after_optimizing_memory():
+    df = pd.DataFrame({
+        'city': ['a', 'b', None, 'a', 'b', 'a'],
+        'x': [1.0, np.nan, 3.0, 4.0, 5.0, 6.0],
+    })
+    optimized = reduce_mem_usage(df)
+    assert isinstance(optimized['city'].dtype, pd.CategoricalDtype)
+
+    filled = fill_missing(optimized, method='custom', custom_value=0)
+
+    assert isinstance(filled['city'].dtype, pd.CategoricalDtype)
+    assert filled['city'].tolist() == ['a', 'b', 0, 'a', 'b', 'a']
+    assert filled['x'].tolist() == [1.0, 0.0, 3.0, 4.0, 5.0, 6.0]
+    # The input frame keeps its original categories
+    assert 0 not in optimized['city'].cat.categories
+
+
+def test_mean_and_median_fill_keep_column_dtypes():
+    df = pd.DataFrame({
+        't': pd.to_timedelta([1, 2, None], unit='s'),
+        'f': np.array([1.5, np.nan, 2.5], dtype='float32'),
+        's': ['a', None, 'b'],
+    })
+
+    for method in ('mean', 'median'):
+        filled = fill_missing(df, method=method)
+
+        assert filled['t'].dtype == df['t'].dtype
+        assert filled['t'].iat[2] == getattr(df['t'], method)()
+        assert filled['f'].dtype == np.float32
+        assert filled['f'].iat[1] == np.float32(2.0)
+        # Non-numeric columns are left alone
+        assert filled['s'].isna().iat[1]